@@ -0,0 +1,36 @@
+from solver import CELLS, LINES
+
+# Game core of tic-tac-toe on bitboards: the marks of each player are an int of 9 bits (bit 3 * row + column),
+# a line is made when the board of a player contains one of the 8 line masks, and the empty cells are the bits
+# that are in neither board. Every board is one of 512 values, so the winning boards and the available moves of
+# every empty mask are precomputed once, and each check of the game is a lookup.
+
+FULL = (1 << CELLS) - 1
+LINE_MASKS = tuple(sum(1 << cell for cell in line) for line in LINES)
+# WINNING[board]: the board contains a line
+WINNING = tuple(any(board & mask == mask for mask in LINE_MASKS) for board in range(FULL + 1))
+# BIT[move]: bit of the cell of the move (row, column)
+BIT = {divmod(cell, 3): 1 << cell for cell in range(CELLS)}
+# MOVES[empty]: the moves in the empty cells, in the order of the cells (as the list of the original Game),
+# as tuples: the same ones are shared by all the games, so they can't be changed by the callers
+MOVES = tuple(tuple(divmod(cell, 3) for cell in range(CELLS) if empty >> cell & 1) for empty in range(FULL + 1))
+
+_keys = dict()
+
+
+def cells(board0: int, board1: int) -> list:
+    '''The 9 cells as in the board of the notebook: -1 empty, 0 and 1 the marks of the players.'''
+    return [0 if board0 >> cell & 1 else 1 if board1 >> cell & 1 else -1 for cell in range(CELLS)]
+
+
+def key(board0: int, board1: int) -> str:
+    '''
+    str of the numpy board reshaped to 9 cells (the keys of the saved policies), without numpy: the cells are
+    right aligned to the widest one, 2 characters if there is a -1. Memoized, there are only 5,478 positions.
+    '''
+    k = _keys.get((board0, board1))
+    if k is None:
+        values = cells(board0, board1)
+        width = 2 if -1 in values else 1
+        k = _keys[(board0, board1)] = '[' + ' '.join(str(value).rjust(width) for value in values) + ']'
+    return k
@@ -0,0 +1,136 @@
+import numpy as np
+
+# Exact solver of tic-tac-toe: every position reachable from the empty board is solved once by minimax with
+# memoization. A position is the board of the notebook flattened (9 cells, -1 empty, 0 and 1 the marks of the
+# two players) and it is identified by a base-3 perfect hash, sum((cell + 1) * 3 ** i): the hash is the index of
+# dense arrays of 3 ** 9 entries storing the outcome of each position with perfect play and its best move.
+# Only 5,478 of the 19,683 entries are legal positions, the others are marked as unreachable.
+
+CELLS = 9
+SIZE = 3 ** CELLS
+LINES = ((0, 1, 2), (3, 4, 5), (6, 7, 8), (0, 3, 6), (1, 4, 7), (2, 5, 8), (0, 4, 8), (2, 4, 6))
+UNREACHABLE = 2
+_POWERS = 3 ** np.arange(CELLS)
+
+
+def index(board) -> int:
+    '''Perfect hash of the board (a 3x3 or flat array, or a sequence of 9 cells).'''
+    return int((np.asarray(board).reshape(CELLS) + 1) @ _POWERS)
+
+
+def board(index: int) -> np.ndarray:
+    '''Flat board of the hash (inverse of index).'''
+    return (index // _POWERS % 3 - 1).astype(np.int8)
+
+
+def key(board) -> str:
+    '''Key of the board in the policies of MyAgent (the same string as Game.get_hash).'''
+    return str(np.asarray(board, dtype=np.int8).reshape(CELLS))
+
+
+def winner(cells) -> int:
+    '''Same codes as Game.check_winner: the player that made a line, 2 if the board is full, -1 if not over.'''
+    for a, b, c in LINES:
+        if cells[a] != -1 and cells[a] == cells[b] == cells[c]:
+            return int(cells[a])
+    return 2 if -1 not in cells else -1
+
+
+def to_move(cells) -> int:
+    '''Player to move: 0 starts, so it moves when both players have the same number of marks.'''
+    return 0 if list(cells).count(0) == list(cells).count(1) else 1
+
+
+class Table(object):
+    '''
+    Outcome of every position for player 0 (1 if it wins, -1 if player 1 wins, 0 if it's a draw, with both players
+    playing perfectly from there) and the cell where the player to move reaches it (-1 if the game is over).
+    Among the moves with the same outcome the one in the lowest cell is kept.
+    '''
+
+    def __init__(self, outcome: np.ndarray, move: np.ndarray) -> None:
+        self.outcome = outcome
+        self.move = move
+
+    @classmethod
+    def build(cls) -> 'Table':
+        table = cls(np.full(SIZE, UNREACHABLE, dtype=np.int8), np.full(SIZE, -1, dtype=np.int8))
+        table._solve([-1] * CELLS, 0, 0)
+        return table
+
+    def _solve(self, cells: list, h: int, player: int) -> int:
+        # cells is changed in place and restored, h is its hash
+        if self.outcome[h] != UNREACHABLE:
+            return self.outcome[h]
+        result = winner(cells)
+        if result >= 0:
+            self.outcome[h] = 0 if result == 2 else 1 - 2 * result
+            return self.outcome[h]
+
+        # player 0 maximizes the outcome, player 1 minimizes it
+        sign = 1 - 2 * player
+        best, best_move = None, -1
+        for cell in range(CELLS):
+            if cells[cell] != -1:
+                continue
+            cells[cell] = player
+            value = self._solve(cells, h + (player + 1) * 3 ** cell, 1 - player)
+            cells[cell] = -1
+            if best is None or sign * value > sign * best:
+                best, best_move = value, cell
+        self.outcome[h], self.move[h] = best, best_move
+        return best
+
+    def positions(self) -> np.ndarray:
+        '''Hashes of all the legal positions.'''
+        return np.flatnonzero(self.outcome != UNREACHABLE)
+
+    def value(self, board) -> int:
+        return int(self.outcome[index(board)])
+
+    def best_move(self, board) -> tuple[int, int]:
+        '''
+        Optimal move of the player to move, as (row, column) like the moves of the players in the notebook.
+        If somebody already made a line the outcome can't change anymore, any empty cell is fine.
+        '''
+        cell = self.move[index(board)]
+        if cell < 0:
+            cell = np.flatnonzero(np.asarray(board).reshape(CELLS) == -1)[0]
+        return divmod(int(cell), 3)
+
+    def policy(self, player: int, draw: float = .1) -> dict:
+        '''
+        State values of MyAgent for player, from the exact outcomes: each position reached by a move of player is
+        worth the reward the agent gets with perfect play from there (1 win, 0 loss, draw as the draw reward).
+        A ready made _state_value, to start the training from the optimum or to skip it.
+        '''
+        rewards = {1 - 2 * player: 1., 0: draw, 2 * player - 1: 0.}
+        values = dict()
+        for h in self.positions():
+            cells = board(h)
+            # player made the last move if it's the turn of the other one (and the board is not empty)
+            if to_move(cells) != player and (cells != -1).any():
+                values[key(cells)] = rewards[int(self.outcome[h])]
+        return values
+
+    def evaluate(self, state_value: dict, player: int) -> float:
+        '''
+        Fraction of the positions of player (legal and not over) where the greedy choice of MyAgent with the given
+        state values (the last move with the highest value, 0 for the unknown states) keeps the exact outcome:
+        how good a trained policy is, without playing any game.
+        '''
+        correct = total = 0
+        for h in self.positions():
+            cells = board(h)
+            if self.move[h] < 0 or to_move(cells) != player:
+                continue
+            value_max, choice = -999, None
+            for cell in np.flatnonzero(cells == -1):
+                cells[cell] = player
+                value = state_value.get(key(cells), 0)
+                if value >= value_max:
+                    value_max, choice = value, index(cells)
+                cells[cell] = -1
+            correct += self.outcome[choice] == self.outcome[h]
+            total += 1
+        return correct / total
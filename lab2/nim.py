@@ -0,0 +1,124 @@
+import sys
+import random
+from collections import namedtuple
+from functools import reduce, lru_cache
+from operator import xor
+
+# Nim core and strategies shared by the lab2 notebooks (nim, misère and the EA)
+
+Nimply = namedtuple("Nimply", "row, num_objects")
+
+
+class Nim:
+    def __init__(self, num_rows: int, k: int = sys.maxsize) -> None:
+        self._rows = [i * 2 + 1 for i in range(num_rows)]
+        self._k = k
+        self._finalstage = False
+        self.__check_final_stage()
+
+    def __bool__(self):
+        return sum(self._rows) > 0
+
+    def __str__(self):
+        return "<" + " ".join(str(_) for _ in self._rows) + ">"
+
+    @property
+    def rows(self) -> tuple:
+        return tuple(self._rows)
+
+    def final_stage(self) -> bool:
+        return self._finalstage
+
+    def nimming(self, ply: Nimply) -> None:
+        row, num_objects = ply
+        assert self._rows[row] >= num_objects
+        assert num_objects <= self._k
+        self._rows[row] -= num_objects
+        self.__check_final_stage()
+
+    def __check_final_stage(self) -> None:
+        # Check if all the remaining rows are at 1 excepted one
+        row_not_one = 0
+
+        for row in self._rows:
+            if row > 1:
+                row_not_one += 1
+
+        if row_not_one == 1:
+            self._finalstage = True
+
+
+def nim_sum(state: Nim) -> int:
+    return reduce(xor, state.rows, 0)
+
+
+def advanced_nim_sum(state: Nim) -> int:
+    # nim-sum of the Grundy values of the rows: with at most k objects per move a row of n objects is worth n mod (k + 1)
+    return reduce(xor, (x % (state._k + 1) for x in state.rows), 0)
+
+
+# The strategies draw from rng, the random module by default: a random.Random instance makes them reproducible
+# (and independent from the other games when they are played in parallel, see nim_ea.py)
+
+
+def pure_random(state: Nim, rng=random) -> Nimply:
+    """A completely random move"""
+    row = rng.choice([r for r, c in enumerate(state.rows) if c > 0])
+    num_objects = rng.randint(1, min(state._k, state._rows[row]))
+    return Nimply(row, num_objects)
+
+
+def gabriele(state: Nim, rng=random) -> Nimply:
+    """Pick always the maximum possible number of the lowest row"""
+    # the first row that is not empty, all of it (same as the max over all the possible moves), at most k
+    row = next(r for r, c in enumerate(state.rows) if c > 0)
+    return Nimply(row, min(state._k, state.rows[row]))
+
+
+def spicy_moves(rows: tuple, k: int, target: int) -> list:
+    # Moves that leave an advanced nim-sum equal to target, in the same order as enumerating every (row, num_objects).
+    # Removing n objects from a row of c changes its Grundy value from c % (k+1) to (c-n) % (k+1), and the values
+    # reached with 1 <= n <= min(k, c) are all different: so in each row at most one n gives the wanted value,
+    # and it is computed directly instead of trying every move on a copy of the game
+    total = reduce(xor, (c % (k + 1) for c in rows), 0)
+    moves = list()
+    for r, c in enumerate(rows):
+        want = total ^ (c % (k + 1)) ^ target
+        if want > k:
+            continue
+        n = (c - want) % (k + 1)
+        if 1 <= n <= min(k, c):
+            moves.append(Nimply(r, n))
+    return moves
+
+
+def optimal(state: Nim, rng=random) -> Nimply:
+    """Leaves the opponent with advanced nim-sum 0, if possible"""
+    moves = spicy_moves(state.rows, state._k, 0)
+    if not moves:
+        return pure_random(state, rng)
+    return rng.choice(moves)
+
+
+@lru_cache(maxsize=2**16)
+def misere_moves(rows: tuple, k: int, finalstage: bool) -> tuple:
+    # In the final stage the goal is to leave an advanced nim-sum of 1, otherwise 0 without entering a final stage
+    # (when k is limited a final stage reached with a nim-sum different from 1 is a losing one).
+    # The positions repeat a lot among games, so the filtered moves are memoized
+    if finalstage:
+        return tuple(spicy_moves(rows, k, 1))
+    moves = spicy_moves(rows, k, 0)
+    if k != sys.maxsize:
+        not_one = sum(1 for c in rows if c > 1)
+        # a move makes a final stage if afterwards exactly one row has more than one object,
+        # and then its nim-sum is 0 (so it would be pruned)
+        moves = [ply for ply in moves if not_one - (rows[ply.row] > 1) + (rows[ply.row] - ply.num_objects > 1) != 1]
+    return tuple(moves)
+
+
+def misere_optimal(state: Nim, rng=random) -> Nimply:
+    """Optimal strategy of the misère variation (see README)"""
+    moves = misere_moves(state.rows, state._k, state.final_stage())
+    if not moves:
+        return pure_random(state, rng)
+    return rng.choice(moves)
@@ -0,0 +1,81 @@
+import os
+import random
+from multiprocessing import Pool
+
+import numpy as np
+
+from nim import Nim, pure_random, gabriele, optimal
+
+# Fitness engine of the EA (lab2-nim-ea): the games of a whole generation are played in a pool of processes.
+# Each individual plays with its own random.Random, seeded from the seed of the generation and its position,
+# so the fitnesses don't depend on the number of processes nor on the order in which the workers pick them up.
+
+STRATEGIES = (pure_random, gabriele, optimal)
+
+
+def choose_strategy(probabilities: list, rng: random.Random) -> int:
+    """Index of the strategy picked with the given (normalized) probabilities, on their cumulative sum"""
+    cumulative_p = 0
+    chosen_strategy = None
+    rand_strategy = rng.random()
+    for i, p in enumerate(probabilities):
+        if cumulative_p <= rand_strategy <= cumulative_p + p:
+            chosen_strategy = i
+        cumulative_p += p
+    return chosen_strategy
+
+
+def fitness(genotype: np.ndarray, games: int, rows: int, rng: random.Random) -> float:
+    """Percentage of wins of the individual against each strategy in turn, alternating the starting player"""
+    # the tendencies are normalized once, not at every ply
+    probabilities = np.abs(np.asarray(genotype[:len(STRATEGIES)], dtype=float))
+    probabilities = (probabilities / probabilities.sum()).tolist()
+    wins = 0
+    for game in range(games):
+        nim = Nim(rows)
+        player = 1 if game % 2 == 0 else 0
+        opponent = STRATEGIES[game % len(STRATEGIES)]
+        while nim:
+            if player == 0:
+                ply = STRATEGIES[choose_strategy(probabilities, rng)](nim, rng)
+            else:
+                ply = opponent(nim, rng)
+            nim.nimming(ply)
+            player = 1 - player
+        if player == 1:
+            wins += 1
+    return wins / games
+
+
+def _fitness_task(task: tuple) -> float:
+    genotype, games, rows, seed = task
+    return fitness(genotype, games, rows, random.Random(seed))
+
+
+class FitnessEngine(object):
+    """
+    Evaluates whole generations in a pool of processes, the pool is kept alive between generations.
+    Use it as a context manager (or call close) to terminate the workers.
+    """
+
+    def __init__(self, games: int, rows: int, processes: int = None) -> None:
+        self._games = games
+        self._rows = rows
+        self._processes = processes or os.cpu_count()
+        self._pool = Pool(self._processes)
+
+    def evaluate(self, genotypes: list, seed: int = None) -> list:
+        """Fitnesses of the genotypes, the same for the same seed (None draws a fresh one)"""
+        seeds = [s.generate_state(1)[0] for s in np.random.SeedSequence(seed).spawn(len(genotypes))]
+        tasks = [(g, self._games, self._rows, int(s)) for g, s in zip(genotypes, seeds)]
+        return self._pool.map(_fitness_task, tasks, chunksize=max(1, len(tasks) // (4 * self._processes)))
+
+    def close(self) -> None:
+        self._pool.close()
+        self._pool.join()
+
+    def __enter__(self) -> 'FitnessEngine':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -0,0 +1,137 @@
+import os
+import sys
+import random
+from functools import lru_cache
+from math import comb
+
+import numpy as np
+
+from nim import Nim, Nimply, pure_random
+
+# Exact solver of Nim and misère with any k, by retrograde analysis.
+# The order of the rows doesn't matter, so a position is the sorted tuple of its rows (padded with zeros up to the
+# number of rows of the table), and it is identified by its rank in the colexicographic order of these tuples:
+# the rank is used as the index of dense arrays, storing for each position if the player to move wins and how.
+
+
+@lru_cache(maxsize=None)
+def _combinations(n: int, m: int) -> np.ndarray:
+    # all the strictly increasing tuples of n values in range(m), in colexicographic order
+    if n == 0:
+        return np.zeros((1, 0), dtype=np.int16)
+    return np.concatenate([
+        np.column_stack((_combinations(n - 1, last), np.full(comb(last, n - 1), last, dtype=np.int16)))
+        for last in range(n - 1, m)
+    ])
+
+
+class NimTable(object):
+    '''
+    Outcome and winning move of every position with at most rows rows of at most size objects each.
+    A position is won by the player to move if at least one move leads to a lost position: the positions are analyzed
+    from the empty one, in order of objects left, and every lost position marks as won all the positions that
+    reach it with one move (the one that is not marked when its turn comes is lost).
+    '''
+
+    def __init__(self, rows: int, size: int, k: int, misere: bool,
+                 outcome: np.ndarray, move_row: np.ndarray, move_take: np.ndarray) -> None:
+        self.rows = rows
+        self.size = size
+        self.k = k
+        self.misere = misere
+        self._outcome = outcome
+        # the winning move is stored as the size of the row to pick from and the objects to take (0 if lost)
+        self._move_row = move_row
+        self._move_take = move_take
+        # binom[j, v] = C(v, j + 1): the rank of a sorted tuple a is sum(C(a[j] + j, j + 1))
+        self._binom = np.array([[comb(v, j + 1) for v in range(size + rows)] for j in range(rows)], dtype=np.int64)
+
+    @classmethod
+    def build(cls, rows: int, size: int = None, k: int = sys.maxsize, misere: bool = False) -> 'NimTable':
+        '''Solves all the positions, size is by default the biggest row of Nim(rows).'''
+        size = 2 * rows - 1 if size is None else size
+        assert size < 256, 'rows are stored as uint8'
+        states = (_combinations(rows, size + rows) - np.arange(rows, dtype=np.int16)).astype(np.uint8)
+        table = cls(rows, size, k, misere, np.zeros(len(states), dtype=np.uint8),
+                    np.zeros(len(states), dtype=np.uint8), np.zeros(len(states), dtype=np.uint8))
+        won = table._outcome
+
+        # the empty position is lost by the player to move in nim, won in misère (the opponent took the last object)
+        won[0] = misere
+        totals = states.sum(axis=1, dtype=np.int32)
+        order = np.argsort(totals, kind='stable')
+        levels = np.searchsorted(totals[order], np.arange(totals.max() + 2))
+
+        for level in range(totals.max() + 1):
+            positions = order[levels[level]:levels[level + 1]]
+            lost = states[positions[won[positions] == 0]]
+            # every lost position makes won the ones with t more objects (t <= k) in one of the rows
+            for row in range(rows):
+                for take in range(1, min(k, size) + 1):
+                    parents = lost[lost[:, row] + take <= size].astype(np.int16)
+                    if len(parents) == 0:
+                        break
+                    parents[:, row] += take
+                    bigger = parents[:, row].copy()
+                    parents.sort(axis=1)
+                    ranks = table._ranks(parents)
+                    new = won[ranks] == 0
+                    won[ranks[new]] = 1
+                    table._move_row[ranks[new]] = bigger[new]
+                    table._move_take[ranks[new]] = take
+
+        _combinations.cache_clear()
+        return table
+
+    @classmethod
+    def load(cls, path: str) -> 'NimTable':
+        data = np.load(path)
+        return cls(int(data['rows']), int(data['size']), int(data['k']), bool(data['misere']),
+                   data['outcome'], data['move_row'], data['move_take'])
+
+    def save(self, path: str) -> None:
+        np.savez_compressed(path, rows=self.rows, size=self.size, k=self.k, misere=self.misere,
+                            outcome=self._outcome, move_row=self._move_row, move_take=self._move_take)
+
+    def _ranks(self, states: np.ndarray) -> np.ndarray:
+        # colexicographic ranks of sorted tuples (one per row of states)
+        j = np.arange(states.shape[1])
+        return self._binom[j, states + j].sum(axis=1)
+
+    def key(self, rows: tuple) -> int:
+        '''Index of the position in the table.'''
+        if len(rows) > self.rows or max(rows, default=0) > self.size:
+            raise ValueError(f'{rows} is not in the table ({self.rows} rows of at most {self.size} objects)')
+        canonical = [0] * (self.rows - len(rows)) + sorted(rows)
+        return int(self._ranks(np.array([canonical], dtype=np.int64))[0])
+
+    def wins(self, rows: tuple) -> bool:
+        '''True if the player to move wins (with perfect play on both sides).'''
+        return bool(self._outcome[self.key(rows)])
+
+    def best_move(self, rows: tuple) -> Nimply:
+        '''A winning move, None if the position is lost.'''
+        i = self.key(rows)
+        if not self._outcome[i] or self._move_take[i] == 0:
+            return None
+        return Nimply(rows.index(int(self._move_row[i])), int(self._move_take[i]))
+
+    def strategy(self):
+        '''Optimal strategy: the winning move of the table, a random one if the position is lost.'''
+        def optimal(state: Nim, rng=random) -> Nimply:
+            assert state._k == self.k, f'the table is for k={self.k}'
+            ply = self.best_move(state.rows)
+            return pure_random(state, rng) if ply is None else ply
+        return optimal
+
+
+def solve(rows: int, k: int = sys.maxsize, misere: bool = False, size: int = None, folder: str = 'nim_tables') -> NimTable:
+    '''The table of the game, loaded from folder if it was already solved, otherwise built and saved there.'''
+    size = 2 * rows - 1 if size is None else size
+    path = os.path.join(folder, f'{"misere" if misere else "nim"}_r{rows}_s{size}_k{k}.npz')
+    if os.path.exists(path):
+        return NimTable.load(path)
+    table = NimTable.build(rows, size, k, misere)
+    os.makedirs(folder, exist_ok=True)
+    table.save(path)
+    return table
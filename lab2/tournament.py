@@ -0,0 +1,138 @@
+import os
+import random
+import zlib
+from functools import lru_cache
+from multiprocessing import Pool
+
+import numpy as np
+import matplotlib.pyplot as plt
+import matplotlib.ticker as mticker
+
+from nim import Nim, Nimply, pure_random, gabriele, optimal, misere_optimal
+from nim_solver import solve
+
+# Tournament of strategies for the lab2 result plots: every matchup plays N games for each k and number of rows.
+# The games are spread over a pool of processes, one task for each (matchup, k, #rows), each with its own seeded
+# random generator; the wins of every (matchup, k) are saved as soon as they are complete, so an interrupted run
+# restarts from there and the plots are made again from the saved wins without replaying any game.
+
+
+def exact(state: Nim, rng=random) -> Nimply:
+    """Optimal strategy of nim from the exact tables (see nim_solver.py)"""
+    ply = _table(len(state.rows), state._k, False).best_move(state.rows)
+    return pure_random(state, rng) if ply is None else ply
+
+
+def exact_misere(state: Nim, rng=random) -> Nimply:
+    """Optimal strategy of misère from the exact tables (see nim_solver.py)"""
+    ply = _table(len(state.rows), state._k, True).best_move(state.rows)
+    return pure_random(state, rng) if ply is None else ply
+
+
+@lru_cache(maxsize=None)
+def _table(rows: int, k: int, misere: bool):
+    # one table per process, loaded from nim_tables/ (they are solved by run before starting the pool)
+    return solve(rows, k, misere)
+
+
+# strategies by name, the names are the ones in the matchups and in the files
+STRATEGIES = {
+    'pure_random': pure_random,
+    'gabriele': gabriele,
+    'optimal': optimal,
+    'misere_optimal': misere_optimal,
+    'exact': exact,
+    'exact_misere': exact_misere,
+}
+
+
+def play(strategy: tuple, rows: int, k: int, misere: bool, rng: random.Random) -> int:
+    """Plays a game started by player 0, returns the winner"""
+    nim = Nim(rows, k)
+    player = 0
+    while nim:
+        nim.nimming(strategy[player](nim, rng))
+        player = 1 - player
+    # player is now the one that didn't take the last object
+    return player if misere else 1 - player
+
+
+def _games(task: tuple) -> tuple:
+    matchup, k, rows, games, misere, seed = task
+    # the seed of a task depends only on its parameters, not on the order in which the tasks are played
+    entropy = [seed, k, rows, int(misere), zlib.crc32('-'.join(matchup).encode())]
+    rng = random.Random(int(np.random.SeedSequence(entropy).generate_state(1)[0]))
+    strategy = tuple(STRATEGIES[name] for name in matchup)
+    wins = [0, 0]
+    for _ in range(games):
+        wins[play(strategy, rows, k, misere, rng)] += 1
+    return matchup, k, rows, wins[0]
+
+
+def _path(folder: str, matchup: tuple, k: int, misere: bool) -> str:
+    # the two games have different files, so normal and misère results can share a folder
+    return os.path.join(folder, '-'.join(matchup), f'k={k}-misere.npz' if misere else f'k={k}.npz')
+
+
+def load(folder: str, matchup: tuple, k: int, misere: bool = False) -> dict:
+    """Saved results of a matchup for k (rows, wins of player 0, games, seed and misere), None if it was never played"""
+    path = _path(folder, matchup, k, misere)
+    if not os.path.exists(path):
+        return None
+    data = np.load(path)
+    return {name: data[name] for name in data.files}
+
+
+def run(matchups: list, ks: range, rows: range, games: int, misere: bool = False, seed: int = 0,
+        folder: str = 'nim_data', processes: int = None) -> None:
+    """
+    Plays all the matchups (pairs of names of STRATEGIES, the first one starts) for each k and number of rows.
+    The (matchup, k) already saved in folder with the same rows, games, seed and game (normal or misère) are skipped.
+    """
+    rows = list(rows)
+    todo = dict()
+    for matchup in map(tuple, matchups):
+        for k in ks:
+            saved = load(folder, matchup, k, misere)
+            if (saved is not None and list(saved['rows']) == rows and saved['games'] == games and saved['seed'] == seed
+                    and 'misere' in saved and saved['misere'] == misere):
+                continue
+            todo[matchup, k] = dict()
+    if not todo:
+        return
+
+    # the tables of the exact strategies are solved here once, the workers just load them
+    for matchup, k in todo:
+        for name in matchup:
+            if name in ('exact', 'exact_misere'):
+                for r in rows:
+                    solve(r, k, name == 'exact_misere')
+
+    tasks = [(matchup, k, r, games, misere, seed) for matchup, k in todo for r in rows]
+    with Pool(processes) as pool:
+        for matchup, k, r, wins in pool.imap_unordered(_games, tasks):
+            todo[matchup, k][r] = wins
+            if len(todo[matchup, k]) == len(rows):
+                path = _path(folder, matchup, k, misere)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                np.savez(path, rows=rows, wins=[todo[matchup, k][r] for r in rows], games=games, seed=seed,
+                         misere=misere)
+
+
+def plot(folder: str, matchup: tuple, ks: range, results: str, misere: bool = False) -> None:
+    """Makes the plot of each k (the percentage of games won by player 0 for each number of rows) from the saved wins"""
+    os.makedirs(results, exist_ok=True)
+    for k in ks:
+        saved = load(folder, tuple(matchup), k, misere)
+        if saved is None:
+            continue
+        plt.figure()
+        plt.grid()
+        plt.ylim([-5, 105])
+        plt.gca().xaxis.set_major_locator(mticker.MultipleLocator(1))
+        plt.title(f'k={k}, starting player 0')
+        plt.xlabel('#rows')
+        plt.ylabel('won games (%)')
+        plt.plot(saved['rows'], 100 * saved['wins'] / saved['games'])
+        plt.savefig(os.path.join(results, f'k={k}.png'))
+        plt.close()
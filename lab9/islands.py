@@ -0,0 +1,129 @@
+import multiprocessing as mp
+import queue
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+
+import lab9_lib
+import operators
+from runlog import RunLogger, ConvergenceTracker, diversity
+
+
+@dataclass
+class Parameters:
+    '''Hyperparameters of the EA run by each island (same meaning of the constants in the notebook).'''
+    loci: int = 1000
+    population_island: int = 50
+    offsprings: int = 25
+    tournament_size: int = 25
+    max_generations: int = 5000
+    migration_rate: int = 100
+    migrants: int = 5
+    steady_state_rate: int = 200
+    threshold_improvement: float = 1e-3
+
+
+@dataclass
+class Result:
+    '''Outcome of a run: the best individual among all islands and the fitness calls of all the islands.'''
+    fitness: float
+    genotype: np.ndarray
+    calls: int
+    generations: int
+    history: list = field(default_factory=list)  # history[isl][gen] = best fitness of the island
+
+
+def _island(isl: int, instance: int, params: Parameters, seed: np.random.SeedSequence,
+            inbox: mp.Queue, outbox: mp.Queue, reports: mp.Queue, stop: mp.Event) -> None:
+    '''Runs the EA of a single island, in its own process and with its own generator.'''
+    # migrants that were not picked up when the neighbour stopped must not block the exit of this process
+    outbox.cancel_join_thread()
+    rng = np.random.default_rng(seed)
+    fitness = lab9_lib.make_problem(instance)
+
+    population = rng.integers(0, 2, size=(params.population_island, params.loci), dtype=np.uint8)
+    fitnesses = fitness.batch(population)
+    history = list()
+    tracker = ConvergenceTracker(params.steady_state_rate, params.threshold_improvement)
+
+    for gen in range(params.max_generations):
+        if stop.is_set():
+            break
+        start = time.perf_counter()
+
+        # after each migration_rate generations the best individuals are sent to the next island,
+        # the migrants that arrived from the previous one (if any) replace the worst individuals
+        if gen != 0 and gen % params.migration_rate == 0:
+            outbox.put((population[:params.migrants].copy(), fitnesses[:params.migrants].copy()))
+            try:
+                while True:
+                    migrants, migrants_fitnesses = inbox.get_nowait()
+                    population[-len(migrants):] = migrants
+                    fitnesses[-len(migrants):] = migrants_fitnesses
+            except queue.Empty:
+                pass
+
+        offsprings = operators.generation(population, fitnesses, params.offsprings, params.tournament_size, rng)
+        population = np.concatenate((population, offsprings))
+        fitnesses = np.concatenate((fitnesses, fitness.batch(offsprings)))
+        survivors = np.argsort(-fitnesses, kind='stable')[:params.population_island]
+        population, fitnesses = population[survivors], fitnesses[survivors]
+        history.append(fitnesses[0])
+
+        steady = tracker.update(fitnesses[0])
+        reports.put(('generation', isl, gen, fitnesses[0], fitness.calls, steady,
+                     fitnesses.mean(), diversity(population), time.perf_counter() - start))
+
+    reports.put(('done', isl, population[0], fitnesses[0], fitness.calls, history))
+
+
+def run_islands(instance: int, islands: int, params: Parameters = None, seed: int = None,
+                logger: RunLogger = None) -> Result:
+    '''
+    Island model with one process per island: each island evolves its own population with its own generator,
+    the migrants travel in a ring through queues. The coordinator (this process) stops all the islands as soon as
+    one of them reaches fitness 1, or when all of them are in a steady state.
+    If a logger is given, the metrics of every generation of every island are streamed to it.
+    Without params the defaults of Parameters are used (a new instance for each run).
+    '''
+    params = Parameters() if params is None else params
+    seeds = np.random.SeedSequence(seed).spawn(islands)
+    inboxes = [mp.Queue() for _ in range(islands)]
+    reports = mp.Queue()
+    stop = mp.Event()
+    workers = [
+        mp.Process(target=_island, args=(isl, instance, params, seeds[isl], inboxes[isl], inboxes[(isl + 1) % islands], reports, stop))
+        for isl in range(islands)
+    ]
+    for w in workers:
+        w.start()
+
+    steady_state = [False for _ in range(islands)]
+    finals = dict()
+    while len(finals) < islands:
+        message = reports.get()
+        if message[0] == 'done':
+            finals[message[1]] = message[2:]
+            continue
+
+        _, isl, gen, best, calls, steady, mean, div, seconds = message
+        steady_state[isl] = steady
+        if logger is not None:
+            logger.log(instance=instance, island=isl, generation=gen, best=best, mean=mean, calls=calls,
+                       diversity=div, seconds=seconds)
+        if best == 1 or all(steady_state):
+            stop.set()
+
+    for w in workers:
+        w.join()
+
+    champion = max(finals, key=lambda isl: finals[isl][1])
+    history = [finals[isl][3] for isl in range(islands)]
+    return Result(
+        fitness=float(finals[champion][1]),
+        genotype=finals[champion][0],
+        calls=sum(finals[isl][2] for isl in range(islands)),
+        generations=max(len(h) for h in history),
+        history=history,
+    )
@@ -3,11 +3,54 @@
 # Free for personal or classroom use; see 'LICENSE.md' for details.
 
 from abc import abstractmethod
+from collections import OrderedDict, namedtuple
+from functools import lru_cache
+from hashlib import blake2b
+
+import numpy as np
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+def _digest(data):
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(data)
+    return int.from_bytes(blake2b(data, digest_size=8).digest(), "little")
+
+
+def genome_key(genome):
+    # 64 bits digest of the genes (any representation with the same genes gets the same key)
+    if hasattr(genome, "packed_bytes"):
+        packed = genome.packed_bytes()
+    else:
+        packed = np.packbits(np.asarray(genome) != 0, bitorder="little").tobytes()
+    return _digest(len(genome).to_bytes(4, "little") + packed)
+
+
+@lru_cache
+def _penalties(x):
+    # row n weights a sorted fitness vector with n best values: the best ones are weighted 0,
+    # the k-th worse one 0.1 ** (k + 1), the same powers computed by the original generator
+    penalties = np.zeros((x + 1, x))
+    for n in range(x + 1):
+        penalties[n, n:] = [0.1 ** (k + 1) for k in range(x - n)]
+    return penalties
 
 
 class AbstractProblem:
-    def __init__(self):
+    def __init__(self, cache_size=0):
+        # with cache_size > 0 the fitness of the last cache_size genomes is remembered (LRU):
+        # evaluating again one of them is not a call
         self._calls = 0
+        self._cache = OrderedDict() if cache_size > 0 else None
+        self._cache_size = cache_size
+        self._hits = 0
+        self._misses = 0
 
     @property
     @abstractmethod
@@ -22,20 +65,156 @@ class AbstractProblem:
     def onemax(genome):
         return sum(bool(g) for g in genome)
 
+    def strided_onemax(self, genomes):
+        # onemax(genome[s::x]) for every s: each genome is seen as a (len/x, x) matrix and its columns are summed
+        # works both on a single genome and on a (P, len) population
+        if hasattr(genomes, "strided_onemax"):
+            # packed genomes count each stride with a popcount
+            return genomes.strided_onemax(self.x)
+        genomes = np.asarray(genomes) != 0
+        loci = -(-genomes.shape[-1] // self.x) * self.x
+        if loci != genomes.shape[-1]:
+            padding = np.zeros(genomes.shape[:-1] + (loci - genomes.shape[-1],), dtype=bool)
+            genomes = np.concatenate((genomes, padding), axis=-1)
+        return genomes.reshape(genomes.shape[:-1] + (-1, self.x)).sum(axis=-2)
+
+    def _fitness(self, counts, loci):
+        # counts is a (P, x) matrix of strided onemax, returns the P fitnesses
+        fitnesses = np.sort(counts, axis=1)[:, ::-1]
+        best = fitnesses[:, 0]
+        n_best = np.count_nonzero(fitnesses == best[:, None], axis=1)
+        # cumsum adds left to right, exactly like the builtin sum
+        penalty = np.cumsum(fitnesses * _penalties(self.x)[n_best], axis=1)[:, -1]
+        return (best * n_best - penalty) / loci
+
+    def cache_info(self):
+        return CacheInfo(self._hits, self._misses, self._cache_size, len(self._cache) if self._cache is not None else 0)
+
+    def _remember(self, key, fitness):
+        self._cache[key] = fitness
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    def count_call(self, genome, fitness):
+        # an evaluation done outside __call__ and batch (see IncrementalEvaluator): it counts as a call,
+        # unless the genome is in the cache, and the fitness is remembered as __call__ would do
+        if self._cache is not None:
+            key = genome_key(genome)
+            if key in self._cache:
+                self._hits += 1
+                self._cache.move_to_end(key)
+                return
+            self._misses += 1
+            self._remember(key, fitness)
+        self._calls += 1
+
     def __call__(self, genome):
+        if self._cache is not None:
+            key = genome_key(genome)
+            if key in self._cache:
+                self._hits += 1
+                self._cache.move_to_end(key)
+                return self._cache[key]
+            self._misses += 1
+
         self._calls += 1
-        fitnesses = sorted((AbstractProblem.onemax(genome[s :: self.x]) for s in range(self.x)), reverse=True)
-        val = sum(f for f in fitnesses if f == fitnesses[0]) - sum(
-            f * (0.1 ** (k + 1)) for k, f in enumerate(f for f in fitnesses if f < fitnesses[0])
-        )
-        return val / len(genome)
+        fitness = float(self._fitness(self.strided_onemax(genome)[None, :], len(genome))[0])
+        if self._cache is not None:
+            self._remember(key, fitness)
+        return fitness
+
+    def batch(self, genomes):
+        # fitness of a whole (P, len) population in one pass, it counts as P calls
+        if self._cache is None:
+            counts = self.strided_onemax(genomes)
+            self._calls += len(counts)
+            return self._fitness(counts, np.shape(genomes)[-1])
+
+        # only the genomes not in the cache are evaluated (once, even if repeated in the population)
+        genomes = np.asarray(genomes) != 0
+        loci = genomes.shape[-1]
+        packed = np.packbits(genomes, axis=-1, bitorder="little")
+        keys = [_digest(loci.to_bytes(4, "little") + p.tobytes()) for p in packed]
+        missing = dict()
+        for row, key in enumerate(keys):
+            if key not in self._cache and key not in missing:
+                missing[key] = row
+
+        computed = dict()
+        if missing:
+            counts = self.strided_onemax(genomes[list(missing.values())])
+            self._calls += len(counts)
+            computed = dict(zip(missing, self._fitness(counts, loci).tolist()))
+        self._misses += len(missing)
+        self._hits += len(keys) - len(missing)
+
+        fitnesses = np.array([computed[key] if key in computed else self._cache[key] for key in keys])
+        for key in keys:
+            if key in computed:
+                self._remember(key, computed[key])
+            elif key in self._cache:
+                self._cache.move_to_end(key)
+        return fitnesses
+
+    def incremental(self, genomes, count_calls=True):
+        # evaluator of a (P, len) population that is then changed by flipping single genes, see IncrementalEvaluator
+        return IncrementalEvaluator(self, genomes, count_calls)
+
+
+class IncrementalEvaluator:
+    # Keeps the strided onemax counts of each individual: flipping a gene changes only the count of its stride,
+    # so the new fitness comes from the x counts, without looking at the whole genome again.
+    # With count_calls every evaluation is a call of the problem (as it would be calling it on the mutated genome,
+    # so a genome in the fitness cache is not), otherwise only the initial evaluation of the population is counted.
+
+    def __init__(self, problem, genomes, count_calls=True):
+        self._problem = problem
+        self._count_calls = count_calls
+        self._genomes = (np.asarray(genomes) != 0).astype(np.uint8)
+        # 0.1 ** (k + 1), the penalty of the k-th value worse than the best one
+        self._powers = _penalties(problem.x)[0].tolist()
+        self._counts = problem.strided_onemax(self._genomes).tolist()
+        self._fitnesses = [self._score(c) for c in self._counts]
+        for genome, fitness in zip(self._genomes, self._fitnesses):
+            problem.count_call(genome, fitness)
+
+    def _score(self, counts):
+        # AbstractProblem._fitness on the counts of a single genome, in plain Python: on x numbers the numpy calls
+        # would cost more than the whole update. Same powers and same left to right sum, so the same fitness.
+        fitnesses = sorted(counts, reverse=True)
+        best = fitnesses[0]
+        n_best = fitnesses.count(best)
+        penalty = 0.
+        for f, power in zip(fitnesses[n_best:], self._powers):
+            penalty += f * power
+        return (best * n_best - penalty) / self._genomes.shape[1]
+
+    @property
+    def fitnesses(self):
+        return np.array(self._fitnesses)
+
+    def genome(self, individual):
+        return self._genomes[individual].copy()
+
+    def flip(self, individual, genes):
+        # flips the genes (an index or a list of indexes) of the individual, returns its new fitness
+        x = self._problem.x
+        genome, counts = self._genomes[individual], self._counts[individual]
+        for gene in np.atleast_1d(genes).tolist():
+            counts[gene % x] += 1 - 2 * int(genome[gene])
+            genome[gene] ^= 1
+
+        self._fitnesses[individual] = self._score(counts)
+        if self._count_calls:
+            self._problem.count_call(genome, self._fitnesses[individual])
+        return self._fitnesses[individual]
 
 
-def make_problem(a):
+def make_problem(a, cache_size=0):
     class Problem(AbstractProblem):
         @property
         @abstractmethod
         def x(self):
             return a
 
-    return Problem()
+    return Problem(cache_size)
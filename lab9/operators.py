@@ -0,0 +1,65 @@
+import numpy as np
+
+# Genetic operators working on a whole (P, loci) population at once:
+# each function replaces a Python loop over the individuals with a few NumPy operations on the matrix.
+
+
+def tournament(fitnesses: np.ndarray, n: int, size: int, rng: np.random.Generator) -> np.ndarray:
+    '''Indexes of n parents, each one the best of size individuals picked at random (with replacement).'''
+    pools = rng.integers(0, len(fitnesses), size=(n, size))
+    return pools[np.arange(n), np.argmax(fitnesses[pools], axis=1)]
+
+
+def shuffle(genomes: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    '''Independent random permutation of the genes of each genome.'''
+    return rng.permuted(genomes, axis=1)
+
+
+def mutation(genomes: np.ndarray, rng: np.random.Generator, rate: float = None) -> np.ndarray:
+    '''
+    Flips one random gene of each genome (as the mutation of the notebook),
+    or, if rate is given, each gene with probability rate.
+    '''
+    if rate is None:
+        mask = np.zeros(genomes.shape, dtype=bool)
+        mask[np.arange(len(genomes)), rng.integers(0, genomes.shape[1], size=len(genomes))] = True
+    else:
+        mask = rng.random(genomes.shape) < rate
+    return genomes ^ mask.astype(genomes.dtype)
+
+
+def blend(genomes: np.ndarray, donors: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    '''Takes the genes where mask is True from donors, the others from genomes.'''
+    return np.where(mask, donors, genomes)
+
+
+def random_xover(genomes: np.ndarray, donors: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    '''For each genome a random number (from 1 to loci) of random genes is taken from its donor.'''
+    n, loci = genomes.shape
+    taken = rng.integers(1, loci, size=n, endpoint=True)
+    # the rank of a gene in a random permutation selects exactly taken[i] genes in row i
+    ranks = np.argsort(np.argsort(rng.random((n, loci)), axis=1), axis=1)
+    return blend(genomes, donors, ranks < taken[:, None])
+
+
+def uniform_xover(genomes: np.ndarray, donors: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    '''Each gene is taken from the genome or from its donor with the same probability.'''
+    return blend(genomes, donors, rng.random(genomes.shape) < .5)
+
+
+def n_cut_xover(genomes: np.ndarray, donors: np.ndarray, cuts: int) -> np.ndarray:
+    '''Genomes are cut in cuts equal slices, taken alternately from the donors and the genomes (as in the notebook).'''
+    loci = genomes.shape[1]
+    cut_points = np.linspace(0, loci, cuts + 1, dtype=int)
+    mask = np.searchsorted(cut_points, np.arange(loci), side='right') % 2 == 1
+    return blend(genomes, donors, mask[None, :])
+
+
+def generation(population: np.ndarray, fitnesses: np.ndarray, offsprings: int, tournament_size: int,
+               rng: np.random.Generator) -> np.ndarray:
+    '''
+    All the offsprings of a generation with the steps of the notebook:
+    tournament selection of the parents, shuffle, mutation of one gene and random_xover with the parent.
+    '''
+    parents = population[tournament(fitnesses, offsprings, tournament_size, rng)]
+    return random_xover(mutation(shuffle(parents, rng), rng), parents, rng)
@@ -0,0 +1,153 @@
+from functools import lru_cache
+
+import numpy as np
+
+# Genes are stored 64 per word: gene i is bit i % 64 of word i // 64 (little endian),
+# which is the layout of np.packbits(..., bitorder='little'). The bits after the last gene are always 0.
+_WORD_BYTES = 8
+_WORD = np.dtype('<u8')
+_BYTE_POPCOUNT = np.array([bin(b).count('1') for b in range(256)], dtype=np.uint8)
+
+
+def _pack(bits) -> np.ndarray:
+    '''Packs a sequence of genes into words.'''
+    bits = np.asarray(bits) != 0
+    packed = np.packbits(bits, bitorder='little')
+    words = np.zeros(-(-len(bits) // 64) * _WORD_BYTES, dtype=np.uint8)
+    words[:len(packed)] = packed
+    return words.view(_WORD)
+
+
+def _popcount(words: np.ndarray) -> np.ndarray:
+    '''Number of bits set in each row of words (the last axis is summed).'''
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+    # numpy < 2.0: popcount of each byte with a lookup table
+    return _BYTE_POPCOUNT[words.view(np.uint8)].sum(axis=-1, dtype=np.int64)
+
+
+def _frozen(words: np.ndarray) -> np.ndarray:
+    words.flags.writeable = False
+    return words
+
+
+@lru_cache
+def _valid(loci: int) -> np.ndarray:
+    '''Mask of the bits that hold a gene.'''
+    return _frozen(_pack(np.ones(loci, dtype=bool)))
+
+
+@lru_cache
+def _strides(loci: int, x: int) -> np.ndarray:
+    '''(x, words) masks, row s selects the genes genome[s::x].'''
+    return _frozen(np.stack([_pack(np.arange(loci) % x == s) for s in range(x)]))
+
+
+@lru_cache
+def _cuts(loci: int, cuts: int) -> np.ndarray:
+    '''Mask of the slices taken from the second parent in a n_cut_xover: the 1st, the 3rd, ...'''
+    cut_points = np.linspace(0, loci, cuts + 1, dtype=int)
+    return _frozen(_pack(np.searchsorted(cut_points, np.arange(loci), side='right') % 2 == 1))
+
+
+class PackedGenome(object):
+    '''
+    Immutable genome of bits packed in 64 bits words (8 times smaller than a bool array, 64 times smaller than a list of ints).
+    Mutations and crossovers are bitwise operations on whole words, and onemax is a popcount.
+    It behaves as a sequence of genes (len, [], np.asarray), so lab9_lib problems can evaluate it directly.
+    '''
+
+    __slots__ = ('_words', '_loci')
+
+    def __init__(self, words: np.ndarray, loci: int) -> None:
+        self._words = _frozen(words)
+        self._loci = loci
+
+    @classmethod
+    def from_bits(cls, bits) -> 'PackedGenome':
+        '''Packs a genotype given as a list/array of genes.'''
+        return cls(_pack(bits), len(bits))
+
+    @classmethod
+    def random(cls, loci: int, rng: np.random.Generator) -> 'PackedGenome':
+        '''Each gene is 0 or 1 with the same probability, like rnd.choices([0, 1], k=loci).'''
+        words = rng.integers(0, 256, size=len(_valid(loci)) * _WORD_BYTES, dtype=np.uint8).view(_WORD)
+        return cls(words & _valid(loci), loci)
+
+    @property
+    def words(self) -> np.ndarray:
+        '''The (read-only) packed words.'''
+        return self._words
+
+    def bits(self) -> np.ndarray:
+        '''Unpacks the genotype into an array of 0/1.'''
+        return np.unpackbits(self._words.view(np.uint8), count=self._loci, bitorder='little')
+
+    def packed_bytes(self) -> bytes:
+        '''The genes as bytes, the same of np.packbits(genes, bitorder='little').'''
+        return self._words.view(np.uint8)[:-(-self._loci // 8)].tobytes()
+
+    def __len__(self) -> int:
+        return self._loci
+
+    def __getitem__(self, gene: int) -> int:
+        gene = range(self._loci)[gene]
+        return int(self._words[gene // 64] >> np.uint64(gene % 64)) & 1
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        bits = self.bits()
+        return bits if dtype is None else bits.astype(dtype)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, PackedGenome) and self._loci == other._loci and np.array_equal(self._words, other._words)
+
+    def __hash__(self) -> int:
+        return hash((self._loci, self._words.tobytes()))
+
+    def __str__(self) -> str:
+        return ''.join(str(g) for g in self.bits())
+
+    def __xor__(self, mask: 'PackedGenome') -> 'PackedGenome':
+        '''Flips the genes set in mask.'''
+        return PackedGenome(self._words ^ mask._words, self._loci)
+
+    def onemax(self) -> int:
+        '''Number of genes set to 1.'''
+        return int(_popcount(self._words))
+
+    def strided_onemax(self, x: int) -> np.ndarray:
+        '''onemax(genome[s::x]) for every s in range(x), with a popcount for each stride.'''
+        return _popcount(self._words & _strides(self._loci, x))
+
+    def flip(self, genes) -> 'PackedGenome':
+        '''Mutation: flips the given genes (an index or a list of indexes) with a xor mask.'''
+        mask = np.zeros(self._loci, dtype=bool)
+        mask[genes] = True
+        return PackedGenome(self._words ^ _pack(mask), self._loci)
+
+    def mutation(self, rng: np.random.Generator, n: int = 1) -> 'PackedGenome':
+        '''Flips n different random genes.'''
+        return self.flip(rng.choice(self._loci, size=n, replace=False))
+
+    def shuffle(self, rng: np.random.Generator) -> 'PackedGenome':
+        '''Random permutation of the genes (not word-parallel: genes need to be unpacked).'''
+        return PackedGenome.from_bits(rng.permutation(self.bits()))
+
+    def blend(self, other: 'PackedGenome', mask: np.ndarray) -> 'PackedGenome':
+        '''Takes the genes selected by the mask words from other, the remaining ones from self.'''
+        return PackedGenome((self._words & ~mask) | (other._words & mask), self._loci)
+
+    def n_cut_xover(self, other: 'PackedGenome', cuts: int) -> 'PackedGenome':
+        '''The genome is cut in cuts equal slices, taken alternately from other and self (as in the notebook).'''
+        return self.blend(other, _cuts(self._loci, cuts))
+
+    def uniform_xover(self, other: 'PackedGenome', rng: np.random.Generator) -> 'PackedGenome':
+        '''Each gene is taken from self or other with the same probability.'''
+        return self.blend(other, PackedGenome.random(self._loci, rng)._words)
+
+    def random_xover(self, other: 'PackedGenome', rng: np.random.Generator) -> 'PackedGenome':
+        '''A random number (from 1 to loci) of random genes is taken from other.'''
+        genes = rng.choice(self._loci, size=rng.integers(1, self._loci, endpoint=True), replace=False)
+        mask = np.zeros(self._loci, dtype=bool)
+        mask[genes] = True
+        return self.blend(other, _pack(mask))
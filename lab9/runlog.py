@@ -0,0 +1,101 @@
+import os
+import glob
+from collections import deque
+
+import numpy as np
+
+# One record per island per generation
+FIELDS = {
+    'instance': np.int32,
+    'island': np.int32,
+    'generation': np.int32,
+    'best': np.float64,
+    'mean': np.float64,
+    'calls': np.int64,
+    'diversity': np.float64,
+    'seconds': np.float64,
+}
+
+
+def diversity(population: np.ndarray) -> float:
+    '''Mean hamming distance between two individuals of the (P, loci) population, divided by loci (0 = all clones).'''
+    population = np.asarray(population) != 0
+    n, loci = population.shape
+    if n < 2:
+        return 0.
+    ones = population.sum(axis=0, dtype=np.int64)
+    # at each locus the pairs of individuals that differ are ones * zeros
+    return float((ones * (n - ones)).sum() / (n * (n - 1) / 2 * loci))
+
+
+class RunLogger(object):
+    '''
+    Streams the metrics of a run to a directory, as append-only chunks of columns (chunk_<n>.npz).
+    Only the current chunk is kept in memory, so the memory doesn't depend on the length of the run,
+    and the chunks already written can be read (see load) while the run is still going.
+    A directory holds a single run: if it already has chunks, they are deleted with overwrite=True,
+    otherwise the logger refuses to mix the two runs.
+    '''
+
+    def __init__(self, path: str, chunk_size: int = 1024, overwrite: bool = False) -> None:
+        os.makedirs(path, exist_ok=True)
+        old = glob.glob(os.path.join(path, 'chunk_*.npz'))
+        if old and not overwrite:
+            raise FileExistsError(f'{path} already contains a run, use another directory or overwrite=True')
+        for file in old:
+            os.remove(file)
+        self._path = path
+        self._chunk = np.zeros(chunk_size, dtype=list(FIELDS.items()))
+        self._rows = 0
+        self._chunks = 0
+
+    def log(self, **record) -> None:
+        '''Adds a record, with the fields in FIELDS (the missing ones are 0).'''
+        row = self._chunk[self._rows]
+        for name, value in record.items():
+            row[name] = value
+        self._rows += 1
+        if self._rows == len(self._chunk):
+            self.flush()
+
+    def flush(self) -> None:
+        '''Writes the records in memory as a new chunk.'''
+        if self._rows == 0:
+            return
+        file = os.path.join(self._path, f'chunk_{self._chunks:06d}.npz')
+        np.savez(file, **{name: self._chunk[name][:self._rows] for name in FIELDS})
+        self._chunk[:] = 0
+        self._chunks += 1
+        self._rows = 0
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> 'RunLogger':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def load(path: str) -> dict:
+    '''All the records written in path, as a dictionary of columns.'''
+    chunks = [np.load(file) for file in sorted(glob.glob(os.path.join(path, 'chunk_*.npz')))]
+    return {name: np.concatenate([c[name] for c in chunks] or [np.empty(0, dtype=kind)]) for name, kind in FIELDS.items()}
+
+
+class ConvergenceTracker(object):
+    '''
+    Tells when the best fitness is stuck: it improved less than threshold in the last window generations.
+    The check is done at every generation (on a sliding window), not only every window generations,
+    so a stalled run is detected as soon as the window is over.
+    '''
+
+    def __init__(self, window: int, threshold: float) -> None:
+        self._best = deque(maxlen=window + 1)
+        self._threshold = threshold
+
+    def update(self, best: float) -> bool:
+        '''Adds the best fitness of a new generation, returns True if the run is in a steady state.'''
+        self._best.append(best)
+        return len(self._best) == self._best.maxlen and self._best[-1] - self._best[0] < self._threshold
@@ -0,0 +1,79 @@
+import sys
+
+import numpy as np
+
+from lab9_lib import genome_key
+
+
+class TabuCache(object):
+    '''
+    Tabu table: remembers the last size genotypes that were analized, forgetting the oldest one when it is full.
+    A genotype that is analized again becomes the most recent one.
+    The genotypes are stored as 64 bits digests (see lab9_lib.genome_key): a ring buffer keeps the order of insertion
+    and a dictionary maps each digest to its latest position, so membership and eviction are O(1) whatever the size.
+    When a digest is moved to the head its old position is just left stale, and skipped during eviction.
+    '''
+
+    def __init__(self, size: int) -> None:
+        self._size = size
+        # twice the size, so that the stale positions are compacted at most every size insertions
+        self._ring = np.zeros(2 * size, dtype=np.uint64)
+        self._positions = dict()
+        # absolute positions (the ring index is position % len(ring)) of the oldest entry and of the next one
+        self._tail = 0
+        self._head = 0
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, state) -> bool:
+        return genome_key(state) in self._positions
+
+    def tabu_add(self, state) -> bool:
+        '''Adds the state as the most recent one, returns True if it was already in the table.'''
+        key = genome_key(state)
+        hit = key in self._positions
+
+        if not hit and len(self._positions) == self._size:
+            self.__evict()
+        if self._head - self._tail == len(self._ring):
+            self.__compact()
+
+        self._ring[self._head % len(self._ring)] = key
+        self._positions[key] = self._head
+        self._head += 1
+
+        return hit
+
+    def get_table(self) -> np.ndarray:
+        '''Digests in the table, from the oldest to the most recent.'''
+        return np.array([key for key, _ in self.__live()], dtype=np.uint64)
+
+    def memory_usage(self) -> int:
+        '''Approximated size of the table in bytes.'''
+        entry = sys.getsizeof(1 << 63) + sys.getsizeof(self._head)
+        return self._ring.nbytes + sys.getsizeof(self._positions) + len(self._positions) * entry
+
+    def __live(self):
+        '''(digest, position) of the entries that are not stale, from the oldest.'''
+        for position in range(self._tail, self._head):
+            key = int(self._ring[position % len(self._ring)])
+            if self._positions.get(key) == position:
+                yield key, position
+
+    def __evict(self) -> None:
+        '''Forgets the oldest digest.'''
+        while True:
+            key = int(self._ring[self._tail % len(self._ring)])
+            self._tail += 1
+            if self._positions.get(key) == self._tail - 1:
+                del self._positions[key]
+                return
+
+    def __compact(self) -> None:
+        '''Moves the live entries at the beginning of the ring, dropping the stale ones.'''
+        live = list(self.__live())
+        for position, (key, _) in enumerate(live):
+            self._ring[position] = key
+            self._positions[key] = position
+        self._tail, self._head = 0, len(live)
@@ -5,6 +5,7 @@ from collections import defaultdict
 from tqdm import tqdm
 from copy import copy
 from game import Move, Game, MyGame, Player
+from policy_server import SharedPolicy
 
 
 class MyPlayer(Player):
@@ -153,6 +154,13 @@ class RLPlayer(MyPlayer):
         except FileNotFoundError:
             sys.exit(f"ERROR: failed to load the policy, file {file} doesn't exist")
 
+    def attach_policy(self, name: str) -> None:
+        '''
+        Use the policy published in shared memory by a PolicyServer (see policy_server.py) instead of loading a private copy.
+        The policy is read-only: it is meant for testing, with exp_rate=0 and without feeding rewards.
+        '''
+        self._state_value = SharedPolicy(name)
+
     def set_exp_rate(self, exp_rate: float=0.3) -> None:
         '''
         Set exploration rate, usefull when we want to test and set exp_rate=0.
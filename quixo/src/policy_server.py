@@ -0,0 +1,168 @@
+import os
+import sys
+import pickle
+from multiprocessing import shared_memory, resource_tracker
+
+# Layout of the shared block (8-byte words):
+#   [capacity, count] [keys ... (capacity)] [values ... (capacity)]
+# keys are the base-3 encoding of the board (+1, so that 0 marks an empty slot),
+# values are the float64 state values. Collisions are solved with linear probing.
+_HEADER_WORDS = 2
+_EMPTY = 0
+_FIBONACCI = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+
+
+def state_key(state: str) -> int:
+    '''
+    Encodes the hash of a board (the string returned by MyGame.get_hash) as an integer.
+    Each cell (-1, 0, 1) is a base-3 digit, 25 cells fit in 40 bits.
+    '''
+    key = 0
+    for tile in reversed(state.strip('[]').split()):
+        key = key * 3 + int(tile) + 1
+    return key + 1
+
+
+def _slot(key: int, bits: int) -> int:
+    '''Fibonacci hashing of the key into a table of 2**bits slots.'''
+    return ((key * _FIBONACCI) & _MASK64) >> (64 - bits)
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    '''
+    Attach to an existing block without registering it to the resource tracker:
+    the block belongs to the server, a worker must not unlink it when it exits.
+    '''
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+class SharedPolicy(object):
+    '''
+    Read-only view of a policy published by a PolicyServer.
+    It exposes the same lookups that RLPlayer does on its dictionary (get, [], in, len),
+    but the table lives in shared memory: attaching to it costs nothing and no copy is made per process.
+    '''
+
+    def __init__(self, name: str) -> None:
+        self._shm = _attach(name)
+
+        header = self._shm.buf[:_HEADER_WORDS * 8].cast('Q')
+        self._capacity, self._count = header[0], header[1]
+        header.release()
+
+        keys_end = (_HEADER_WORDS + self._capacity) * 8
+        self._keys = self._shm.buf[_HEADER_WORDS * 8:keys_end].cast('Q')
+        self._values = self._shm.buf[keys_end:keys_end + self._capacity * 8].cast('d')
+        self._bits = self._capacity.bit_length() - 1
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, state: str) -> bool:
+        return self.__find(state_key(state)) is not None
+
+    def __getitem__(self, state: str) -> float:
+        idx = self.__find(state_key(state))
+        if idx is None:
+            raise KeyError(state)
+        return self._values[idx]
+
+    def get(self, state: str, default: float = None) -> float:
+        '''Returns the value of the state, or default if the agent doesn't know it.'''
+        idx = self.__find(state_key(state))
+        return default if idx is None else self._values[idx]
+
+    def close(self) -> None:
+        '''Detach from the shared memory (the policy keeps living in the server).'''
+        self._keys.release()
+        self._values.release()
+        self._shm.close()
+
+    def __find(self, key: int) -> int:
+        '''Returns the slot holding key, None if missing.'''
+        idx = _slot(key, self._bits)
+        while True:
+            slot_key = self._keys[idx]
+            if slot_key == key:
+                return idx
+            if slot_key == _EMPTY:
+                return None
+            idx = (idx + 1) & (self._capacity - 1)
+
+
+class PolicyServer(object):
+    '''
+    Loads a policy (the pickled dictionary saved by RLPlayer.save_policy) once,
+    and publishes it as an open addressing hash table in shared memory.
+    Workers attach to it by name with RLPlayer.attach_policy, the server must stay alive while they play.
+    '''
+
+    def __init__(self, file: str, name: str = None) -> None:
+        try:
+            with open(file, 'rb') as fr:
+                state_value = pickle.load(fr)
+        except FileNotFoundError:
+            sys.exit(f"ERROR: failed to load the policy, file {file} doesn't exist")
+
+        # load factor at most 0.5, so that probing chains stay short
+        capacity = 1 << max(2 * len(state_value), 1).bit_length()
+        bits = capacity.bit_length() - 1
+        size = (_HEADER_WORDS + 2 * capacity) * 8
+
+        self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header = self._shm.buf[:_HEADER_WORDS * 8].cast('Q')
+        keys = self._shm.buf[_HEADER_WORDS * 8:(_HEADER_WORDS + capacity) * 8].cast('Q')
+        values = self._shm.buf[(_HEADER_WORDS + capacity) * 8:size].cast('d')
+
+        for state, value in state_value.items():
+            key = state_key(state)
+            idx = _slot(key, bits)
+            while keys[idx] != _EMPTY and keys[idx] != key:
+                idx = (idx + 1) & (capacity - 1)
+            keys[idx] = key
+            values[idx] = float(value)
+
+        header[0], header[1] = capacity, len(state_value)
+        for view in (header, keys, values):
+            view.release()
+
+    @property
+    def name(self) -> str:
+        '''Name of the shared memory block, to be passed to the workers.'''
+        return self._shm.name
+
+    def close(self) -> None:
+        '''Remove the policy from shared memory, attached workers must have finished.'''
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> 'PolicyServer':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+if __name__ == '__main__':
+    # Usage: python policy_server.py ../policies/policy_p1 [../policies/policy_p2 ...]
+    # Every policy is published as quixo_<file name>, e.g. quixo_policy_p1
+    servers = [PolicyServer(file, name=f'quixo_{os.path.basename(file)}') for file in sys.argv[1:]]
+    for server in servers:
+        print(f"Policy published as {server.name}")
+
+    try:
+        input("Press Enter to stop serving the policies...")
+    except (KeyboardInterrupt, EOFError):
+        pass
+    finally:
+        for server in servers:
+            server.close()
@@ -0,0 +1,94 @@
+import math
+from typing import NamedTuple
+
+import numpy as np
+
+# Set cover with bitsets: every set of SETS becomes a Python int with bit j set if it covers the element j,
+# so the coverage of a state is updated with a single OR when a set is taken, and goal check and heuristics
+# are popcounts (int.bit_count) instead of rebuilding the coverage with reduce(np.logical_or, ...) at every node.
+# Python ints have no fixed size: the same code works with PROBLEM_SIZE in the thousands.
+
+
+class BitState(NamedTuple):
+    taken: int  # bit i set if SETS[i] is taken
+    covered: int  # bit j set if the element j is covered by the taken sets
+
+
+def to_mask(tiles: np.ndarray) -> int:
+    '''Bitmask of a boolean array (bit j is tiles[j]).'''
+    return int.from_bytes(np.packbits(np.asarray(tiles, dtype=bool), bitorder='little').tobytes(), 'little')
+
+
+def indexes(mask: int) -> list:
+    '''Positions of the bits set in mask, in increasing order.'''
+    result = list()
+    while mask:
+        low = mask & -mask
+        result.append(low.bit_length() - 1)
+        mask ^= low
+    return result
+
+
+class BitProblem(object):
+    '''
+    The SETS of a set cover problem as bitmasks, with the operations on the states of the search.
+    '''
+
+    def __init__(self, sets) -> None:
+        self.problem_size = len(sets[0])
+        self.num_sets = len(sets)
+        self.masks = tuple(to_mask(s) for s in sets)
+        self.cardinalities = tuple(m.bit_count() for m in self.masks)
+        self.universe = (1 << self.problem_size) - 1
+        self.all_sets = (1 << self.num_sets) - 1
+
+    def state(self, taken=()) -> BitState:
+        '''State with the given sets taken.'''
+        state = BitState(0, 0)
+        for i in taken:
+            state = self.take(state, i)
+        return state
+
+    def take(self, state: BitState, i: int) -> BitState:
+        '''State after taking SETS[i] (one OR on the coverage).'''
+        return BitState(state.taken | (1 << i), state.covered | self.masks[i])
+
+    def not_taken(self, state: BitState) -> list:
+        return indexes(self.all_sets & ~state.taken)
+
+    def goal_check(self, state: BitState) -> bool:
+        return state.covered == self.universe
+
+    def covered(self, state: BitState) -> int:
+        '''Number of covered elements.'''
+        return state.covered.bit_count()
+
+    def missing(self, state: BitState) -> int:
+        '''Number of elements not covered yet.'''
+        return self.problem_size - state.covered.bit_count()
+
+    def gain(self, state: BitState, i: int) -> int:
+        '''Elements not covered yet that SETS[i] would cover.'''
+        return (self.masks[i] & ~state.covered).bit_count()
+
+    def g(self, state: BitState) -> int:
+        return state.taken.bit_count()
+
+    def h(self, state: BitState) -> int:
+        '''Elements still to cover (the old h of the notebook, not admissible).'''
+        return self.missing(state)
+
+    def h1(self, state: BitState) -> int:
+        '''Elements still to cover divided by the biggest set not taken (as h1 of the notebook).'''
+        biggest = max((self.cardinalities[i] for i in self.not_taken(state)), default=0)
+        return math.ceil(self.missing(state) / biggest) if biggest else 0
+
+    def h2(self, state: BitState) -> int:
+        '''
+        As h1, but counting only the elements of each set that are not covered yet: no set covers more than best of the
+        missing elements, so at least missing / best sets are still needed (admissible).
+        '''
+        best = max((self.gain(state, i) for i in self.not_taken(state)), default=0)
+        if best == 0:
+            return 0
+        return math.ceil(self.missing(state) / best)
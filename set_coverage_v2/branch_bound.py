@@ -0,0 +1,154 @@
+import math
+import multiprocessing as mp
+import os
+import time
+from typing import NamedTuple
+
+from bitset import BitProblem, indexes
+
+# Exact set cover by branch and bound, with the subtrees solved in parallel by a pool of processes.
+# At every node the branching element is the rarest one still uncovered (the idea of special_sets in the A*
+# notebook): one of the sets that cover it must be taken, so there is a child for each of them, and the sets
+# already tried by the previous siblings are excluded from the following ones (no subset is visited twice).
+# A node is pruned when the sets taken plus a lower bound of the ones still needed reach the best cover found
+# so far (the incumbent), which is shared among all the processes.
+
+
+class Result(NamedTuple):
+    taken: list  # indexes of the sets of an optimal cover
+    nodes: int
+    seconds: float
+    processes: int
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.seconds if self.seconds else float('inf')
+
+
+# state of each worker, set by _init
+_problem = None
+_element_sets = None
+_incumbent = None
+_lock = None
+
+
+def _init(sets, incumbent, lock) -> None:
+    global _problem, _element_sets, _incumbent, _lock
+    _problem = BitProblem(sets)
+    # _element_sets[j]: bitmask of the sets that cover the element j
+    _element_sets = [0] * _problem.problem_size
+    for i, mask in enumerate(_problem.masks):
+        for j in indexes(mask):
+            _element_sets[j] |= 1 << i
+    _incumbent = incumbent
+    _lock = lock
+
+
+def _children(covered: int, allowed: int) -> list:
+    '''Sets that cover the rarest uncovered element, the most useful first (empty if it can't be covered).'''
+    missing = _problem.universe & ~covered
+    rarest = None
+    for j in indexes(missing):
+        candidates = _element_sets[j] & allowed
+        if rarest is None or candidates.bit_count() < rarest.bit_count():
+            rarest = candidates
+            if rarest.bit_count() <= 1:
+                break
+    return sorted(indexes(rarest), key=lambda i: -(_problem.masks[i] & missing).bit_count())
+
+
+def _bound(covered: int, allowed: int) -> int:
+    '''Missing elements divided by the biggest gain of the allowed sets (0 gain: infinite, the node is a dead end).'''
+    missing = _problem.universe & ~covered
+    best = max(((_problem.masks[i] & missing).bit_count() for i in indexes(allowed)), default=0)
+    return math.ceil(missing.bit_count() / best) if best else math.inf
+
+
+def _branch(covered: int, taken: int, allowed: int, depth: int, result: dict) -> None:
+    result['nodes'] += 1
+    if covered == _problem.universe:
+        with _lock:
+            if depth < _incumbent.value:
+                _incumbent.value = depth
+                result['taken'] = taken
+        return
+    if depth + _bound(covered, allowed) >= _incumbent.value:
+        return
+    for i in _children(covered, allowed):
+        allowed &= ~(1 << i)
+        _branch(covered | _problem.masks[i], taken | (1 << i), allowed, depth + 1, result)
+
+
+def _solve_subtree(task: tuple) -> tuple:
+    covered, taken, allowed, depth = task
+    result = {'nodes': 0, 'taken': None}
+    _branch(covered, taken, allowed, depth, result)
+    return result['taken'], result['nodes']
+
+
+def _split(tasks: int) -> list:
+    '''Expands the root breadth first until there are at least tasks subtrees (covered, taken, allowed, depth).'''
+    frontier = [(0, 0, _problem.all_sets, 0)]
+    while len(frontier) < tasks:
+        covered, taken, allowed, depth = frontier.pop(0)
+        if covered == _problem.universe:
+            frontier.append((covered, taken, allowed, depth))
+            break
+        for i in _children(covered, allowed):
+            allowed &= ~(1 << i)
+            frontier.append((covered | _problem.masks[i], taken | (1 << i), allowed, depth + 1))
+        if not frontier:
+            break
+    return frontier
+
+
+def _greedy(problem: BitProblem) -> int:
+    '''Size of a greedy cover, the first incumbent (num_sets + 1 if the problem is not solvable).'''
+    state = problem.state()
+    while not problem.goal_check(state):
+        i = max(problem.not_taken(state), key=lambda i: problem.gain(state, i), default=None)
+        if i is None or problem.gain(state, i) == 0:
+            return problem.num_sets + 1
+        state = problem.take(state, i)
+    return problem.g(state)
+
+
+def solve(sets, processes: int = None) -> Result:
+    '''
+    Minimum cover of SETS (None as taken if the problem is not solvable). The size of a greedy cover is the first
+    incumbent, so from the start the search only goes where a cover at least as small can be.
+    '''
+    processes = processes or os.cpu_count()
+    start = time.perf_counter()
+    incumbent = mp.RawValue('i', 0)
+    lock = mp.Lock()
+    _init(sets, incumbent, lock)
+    greedy = _greedy(_problem)
+    # one more than the greedy, so that the search finds a cover of that size if nothing is better
+    incumbent.value = greedy + 1
+
+    tasks = _split(4 * processes) if processes > 1 else [(0, 0, _problem.all_sets, 0)]
+    if processes > 1:
+        with mp.Pool(processes, initializer=_init, initargs=(sets, incumbent, lock)) as pool:
+            results = pool.map(_solve_subtree, tasks, chunksize=1)
+    else:
+        results = [_solve_subtree(task) for task in tasks]
+
+    nodes = sum(n for _, n in results)
+    # the subtree that lowered the incumbent last has the best cover
+    covers = [t for t, _ in results if t is not None]
+    best = min(covers, key=lambda t: t.bit_count(), default=None)
+    return Result(None if best is None else indexes(best), nodes, time.perf_counter() - start, processes)
+
+
+def benchmark(sets, max_processes: int = None) -> None:
+    '''Nodes per second and scaling efficiency (speedup / processes) from 1 process up to max_processes.'''
+    max_processes = max_processes or os.cpu_count()
+    base = None
+    for processes in range(1, max_processes + 1):
+        result = solve(sets, processes)
+        base = base or result.seconds
+        speedup = base / result.seconds
+        cover = 'not solvable' if result.taken is None else f'{len(result.taken)} sets'
+        print(f'{processes:>2} processes: {cover}, {result.nodes:,} nodes in {result.seconds:.2f}s '
+              f'({result.nodes_per_second:,.0f} nodes/s), speedup {speedup:.2f}, efficiency {speedup / processes:.0%}')
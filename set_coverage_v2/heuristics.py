@@ -0,0 +1,89 @@
+import math
+
+import numpy as np
+
+from bitset import BitState
+
+try:
+    from scipy.optimize import linprog
+except ImportError:  # the LP bound is optional
+    linprog = None
+
+# Admissible heuristics for the set cover A*, on a precomputed incidence matrix:
+# the marginal gain of every set (the elements not covered yet that it would cover) is a single
+# matrix-vector product on the columns of the uncovered elements, instead of an OR and a sort per set.
+# All the bounds are lower bounds of the number of sets still needed, so A* stays optimal with any of them.
+
+
+def _bits(mask: int, n: int) -> np.ndarray:
+    # the n lowest bits of mask as an array of 0/1
+    packed = np.frombuffer(mask.to_bytes((n + 7) // 8, 'little'), dtype=np.uint8)
+    return np.unpackbits(packed, count=n, bitorder='little')
+
+
+class Heuristics(object):
+    '''
+    Heuristics of a set cover problem. incidence[i, j] is 1 if SETS[i] covers the element j, stored column-major
+    (the sets covering an element are a contiguous column) as float32: the columns of the uncovered elements are
+    gathered without strides and multiplied by a vector of ones through BLAS, so the deeper the node (the fewer
+    elements missing), the cheaper the gains (when most of them are missing the whole matrix is used instead).
+    '''
+
+    def __init__(self, sets) -> None:
+        self.incidence = np.asfortranarray(np.array(sets, dtype=np.float32))
+        self.num_sets, self.problem_size = self.incidence.shape
+        self.cardinalities = self.incidence.sum(axis=1).astype(np.int64)
+
+    def uncovered(self, state: BitState) -> np.ndarray:
+        '''Indexes of the elements not covered yet.'''
+        return np.flatnonzero(_bits(state.covered, self.problem_size) == 0)
+
+    def gains(self, state: BitState) -> np.ndarray:
+        '''Marginal gain of every set (0 for the taken ones, all their elements are covered).'''
+        missing = _bits(state.covered, self.problem_size) == 0
+        columns = np.flatnonzero(missing)
+        if 4 * len(columns) < self.problem_size:
+            # few elements missing (deep nodes): only their columns
+            gains = self.incidence[:, columns] @ np.ones(len(columns), dtype=np.float32)
+        else:
+            gains = self.incidence @ missing.astype(np.float32)
+        return gains.astype(np.int64)
+
+    def h1(self, state: BitState) -> int:
+        '''Missing elements divided by the biggest set not taken.'''
+        missing = self.problem_size - state.covered.bit_count()
+        biggest = self.cardinalities[_bits(state.taken, self.num_sets) == 0].max(initial=0)
+        return math.ceil(missing / biggest) if biggest else 0
+
+    def h2(self, state: BitState) -> int:
+        '''Missing elements divided by the biggest marginal gain: no set covers more than that.'''
+        missing = self.problem_size - state.covered.bit_count()
+        best = self.gains(state).max(initial=0)
+        return math.ceil(missing / best) if best else 0
+
+    def h3(self, state: BitState) -> int:
+        '''
+        Smallest number of sets whose marginal gains sum to the missing elements: any n sets cover at most the sum
+        of the n biggest gains, so this is still admissible, and never lower than h2.
+        '''
+        missing = self.problem_size - state.covered.bit_count()
+        if missing == 0:
+            return 0
+        cumulative = np.cumsum(np.sort(self.gains(state))[::-1])
+        if cumulative[-1] < missing:
+            return 0
+        return int(np.searchsorted(cumulative, missing)) + 1
+
+    def lp(self, state: BitState) -> int:
+        '''
+        LP relaxation of the remaining problem (every missing element covered at least once, 0 <= x_i <= 1),
+        rounded up: the optimum of the integer problem can't be lower. Needs scipy.
+        '''
+        if linprog is None:
+            raise ImportError('the LP bound needs scipy')
+        columns = self.uncovered(state)
+        if len(columns) == 0:
+            return 0
+        result = linprog(np.ones(self.num_sets), A_ub=-self.incidence[:, columns].T, b_ub=-np.ones(len(columns)),
+                         bounds=(0, 1))
+        return math.ceil(result.fun - 1e-9) if result.success else 0
@@ -0,0 +1,124 @@
+import numpy as np
+
+# Set cover instances: seeded generation, dense (as SETS in the notebooks) or sparse (CSR),
+# and a compact binary file that is memory-mapped when loaded, so the same instances can be shared
+# between the notebooks and the benchmarks without generating them again.
+#
+# File format (little endian): a header of 64 bytes
+#   magic b'SETCOVER', version (uint32), layout (uint32, 0 dense, 1 sparse), problem_size, num_sets, nnz (uint64)
+# followed by
+#   dense: the sets as packed bits, num_sets rows of ceil(problem_size / 8) bytes (bit j of row i: SETS[i][j])
+#   sparse: indptr (num_sets + 1 int64) and indices (nnz int32) of the CSR
+
+MAGIC = b'SETCOVER'
+VERSION = 1
+DENSE, SPARSE = 0, 1
+_HEADER = np.dtype([('magic', 'S8'), ('version', '<u4'), ('layout', '<u4'),
+                    ('problem_size', '<u8'), ('num_sets', '<u8'), ('nnz', '<u8')])
+_HEADER_SIZE = 64
+
+
+class SparseSets(object):
+    '''
+    The sets in CSR format: the elements of set i are indices[indptr[i]:indptr[i + 1]], in increasing order.
+    '''
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, problem_size: int) -> None:
+        # asarray doesn't copy arrays that already have the right type (e.g. the memory-mapped ones of load)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.problem_size = problem_size
+        self.num_sets = len(self.indptr) - 1
+
+    @classmethod
+    def from_dense(cls, sets) -> 'SparseSets':
+        '''From SETS as in the notebooks (a boolean array for each set).'''
+        dense = np.asarray(sets, dtype=bool)
+        rows, columns = np.nonzero(dense)
+        indptr = np.zeros(dense.shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=dense.shape[0]), out=indptr[1:])
+        return cls(indptr, columns, dense.shape[1])
+
+    def to_dense(self) -> np.ndarray:
+        dense = np.zeros((self.num_sets, self.problem_size), dtype=bool)
+        dense[np.repeat(np.arange(self.num_sets), self.cardinalities()), self.indices] = True
+        return dense
+
+    def __getitem__(self, i: int) -> np.ndarray:
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def __len__(self) -> int:
+        return self.num_sets
+
+    def cardinalities(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def coverage(self, taken) -> np.ndarray:
+        '''How many of the taken sets cover each element.'''
+        taken = np.asarray(taken, dtype=np.int64)
+        lengths = self.indptr[taken + 1] - self.indptr[taken]
+        # positions in indices of all the elements of the taken sets
+        starts = np.repeat(self.indptr[taken] - np.cumsum(lengths) + lengths, lengths)
+        positions = starts + np.arange(lengths.sum())
+        return np.bincount(self.indices[positions], minlength=self.problem_size)
+
+    def goal_check(self, taken) -> bool:
+        return bool(np.all(self.coverage(taken) > 0))
+
+
+def generate(problem_size: int, num_sets: int, density: float = .3, seed: int = None, sparse: bool = False):
+    '''
+    Random instance where each element is in each set with probability density, the same for the same seed.
+    Dense: a (num_sets, problem_size) boolean array, rng.random((num_sets, problem_size)) < density.
+    Sparse: SparseSets, built without the dense matrix (the size of each set is binomial and its elements are
+    sampled without replacement): same distribution, but not the same instance of the dense one.
+    '''
+    rng = np.random.default_rng(seed)
+    if not sparse:
+        return rng.random((num_sets, problem_size)) < density
+    sizes = rng.binomial(problem_size, density, size=num_sets)
+    indptr = np.zeros(num_sets + 1, dtype=np.int64)
+    np.cumsum(sizes, out=indptr[1:])
+    indices = np.concatenate([np.sort(rng.choice(problem_size, size, replace=False)) for size in sizes] or [[]])
+    return SparseSets(indptr, indices, problem_size)
+
+
+def save(path: str, sets) -> None:
+    '''Writes the instance, dense (array or tuple of arrays) or SparseSets.'''
+    header = np.zeros(1, dtype=_HEADER)
+    header['magic'] = MAGIC
+    header['version'] = VERSION
+    if isinstance(sets, SparseSets):
+        header['layout'] = SPARSE
+        header['problem_size'], header['num_sets'], header['nnz'] = sets.problem_size, sets.num_sets, len(sets.indices)
+        arrays = (sets.indptr.astype('<i8'), sets.indices.astype('<i4'))
+    else:
+        dense = np.asarray(sets, dtype=bool)
+        header['layout'] = DENSE
+        header['problem_size'], header['num_sets'] = dense.shape[1], dense.shape[0]
+        header['nnz'] = np.count_nonzero(dense)
+        arrays = (np.packbits(dense, axis=1, bitorder='little'),)
+
+    with open(path, 'wb') as file:
+        file.write(header.tobytes().ljust(_HEADER_SIZE, b'\0'))
+        for array in arrays:
+            file.write(array.tobytes())
+
+
+def load(path: str):
+    '''
+    Reads an instance written by save. Sparse instances are SparseSets working directly on the memory-mapped
+    arrays (the pages are read from the disk only when they are used, and shared among processes);
+    dense ones are unpacked from the mapped bits into a (num_sets, problem_size) boolean array.
+    '''
+    header = np.fromfile(path, dtype=_HEADER, count=1)[0]
+    if header['magic'] != MAGIC or header['version'] != VERSION:
+        raise ValueError(f'{path} is not a set cover instance (version {VERSION})')
+    problem_size, num_sets, nnz = int(header['problem_size']), int(header['num_sets']), int(header['nnz'])
+
+    if header['layout'] == DENSE:
+        packed = np.memmap(path, dtype=np.uint8, mode='r', offset=_HEADER_SIZE, shape=(num_sets, (problem_size + 7) // 8))
+        return np.unpackbits(packed, axis=1, count=problem_size, bitorder='little').astype(bool)
+    indptr = np.memmap(path, dtype='<i8', mode='r', offset=_HEADER_SIZE, shape=(num_sets + 1,))
+    indices = np.memmap(path, dtype='<i4', mode='r', offset=_HEADER_SIZE + indptr.nbytes, shape=(nnz,))
+    return SparseSets(indptr, indices, problem_size)
@@ -0,0 +1,93 @@
+import heapq
+import time
+from typing import NamedTuple
+
+import numpy as np
+
+from instances import SparseSets, generate
+
+# Set cover on large instances (100k elements, 10k sets), where the exhaustive searches of the notebooks can't go:
+# the sets are stored sparse (CSR, see instances.py), a greedy with lazy gains builds a cover and a local search
+# removes the sets that became redundant. The result is not optimal, but it comes in seconds.
+
+
+class Cover(NamedTuple):
+    taken: np.ndarray  # indexes of the taken sets
+    greedy_size: int  # number of sets before the local search
+    seconds: float
+
+
+def greedy(sets: SparseSets) -> list:
+    '''
+    Takes the set with the biggest marginal gain until everything is covered (ties to the lowest index).
+    The gains only decrease, so the heap keeps possibly stale gains: the top one is recomputed, and it is taken
+    only if it is still not lower than the next one in the heap, otherwise it goes back with its new gain.
+    '''
+    covered = np.zeros(sets.problem_size, dtype=bool)
+    missing = sets.problem_size
+    heap = [(-int(size), i) for i, size in enumerate(sets.cardinalities()) if size > 0]
+    heapq.heapify(heap)
+    taken = list()
+
+    while missing and heap:
+        _, i = heapq.heappop(heap)
+        gain = int(np.count_nonzero(~covered[sets[i]]))
+        if gain == 0:
+            continue
+        if heap and (-gain, i) > heap[0]:
+            heapq.heappush(heap, (-gain, i))
+            continue
+        covered[sets[i]] = True
+        missing -= gain
+        taken.append(i)
+
+    if missing:
+        raise ValueError(f'Problem is not solvable: {missing} elements are not in any set')
+    return taken
+
+
+def remove_redundant(sets: SparseSets, taken: list) -> list:
+    '''
+    Local search: drops the sets whose elements are all covered by at least another taken set.
+    The last sets taken by the greedy are the ones that added less, so they are tried first.
+    '''
+    coverage = sets.coverage(taken)
+    kept = list()
+    for i in reversed(taken):
+        elements = sets[i]
+        if np.all(coverage[elements] > 1):
+            coverage[elements] -= 1
+        else:
+            kept.append(i)
+    return kept[::-1]
+
+
+def solve(sets: SparseSets) -> Cover:
+    start = time.perf_counter()
+    taken = greedy(sets)
+    improved = remove_redundant(sets, taken)
+    return Cover(np.array(improved, dtype=np.int64), len(taken), time.perf_counter() - start)
+
+
+def lower_bound(sets: SparseSets) -> int:
+    '''No cover is smaller than the elements divided by the biggest set.'''
+    return -(-sets.problem_size // int(sets.cardinalities().max()))
+
+
+def benchmark(sizes=((1_000, 100), (10_000, 1_000), (100_000, 10_000)), sets_per_element: int = 20, seed: int = 42) -> None:
+    '''Time and size of the cover for instances of growing size (problem_size, num_sets).'''
+    for problem_size, num_sets in sizes:
+        # each element is in sets_per_element sets on average: with 20 an element in no set is very unlikely
+        density = sets_per_element / num_sets
+        start = time.perf_counter()
+        sets = generate(problem_size, num_sets, density, seed, sparse=True)
+        built = time.perf_counter() - start
+        cover = solve(sets)
+        assert sets.goal_check(cover.taken)
+        print(f'{problem_size:>7,} elements {num_sets:>6,} sets (density {density:g}): instance in {built:.2f}s, '
+              f'cover of {len(cover.taken):,} sets ({cover.greedy_size:,} before local search, '
+              f'lower bound {lower_bound(sets):,}) in {cover.seconds:.2f}s')
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,152 @@
+import heapq
+import math
+from collections import OrderedDict
+from itertools import count
+from typing import Callable, NamedTuple
+
+from bitset import BitProblem, BitState
+
+# Search framework shared by the set cover notebooks (depth first, greedy, A* and IDA*):
+# the frontier is a plain list managed with heapq, instead of queue.PriorityQueue/LifoQueue that take a lock
+# at every put/get and compare the states when two priorities are equal.
+
+
+class Frontier(object):
+    '''
+    Priority queue of the states to expand, on a heapq list of (priority, tie-break, key, item).
+    The tie-break is a counter, so the items are never compared: with lifo=False the ties are broken in order of
+    insertion, with lifo=True the most recent one comes first (and with a constant priority it is a stack).
+    Each key is in the frontier at most once: pushing it again with a lower priority is a decrease-key done by
+    lazy deletion, the old entry stays in the heap and it is just skipped when it is popped.
+    '''
+
+    def __init__(self, lifo: bool = False) -> None:
+        self._heap = list()
+        self._priorities = dict()  # key -> (priority, tie-break) of its valid entry
+        self._counter = count()
+        self._sign = -1 if lifo else 1
+
+    def __len__(self) -> int:
+        return len(self._priorities)
+
+    def __bool__(self) -> bool:
+        return bool(self._priorities)
+
+    def __contains__(self, key) -> bool:
+        return key in self._priorities
+
+    def push(self, item, priority, key) -> bool:
+        '''Adds the item, returns False if key is already in the frontier with a priority that is not worse.'''
+        if key in self._priorities and self._priorities[key][0] <= priority:
+            return False
+        entry = (priority, self._sign * next(self._counter))
+        self._priorities[key] = entry
+        heapq.heappush(self._heap, entry + (key, item))
+        return True
+
+    def pop(self):
+        '''Item with the lowest priority.'''
+        while self._heap:
+            priority, tie, key, item = heapq.heappop(self._heap)
+            # the entry is stale if the key was pushed again (or already popped): the tie-break is unique,
+            # so an old entry with the same priority of the valid one is not taken for it
+            if self._priorities.get(key) == (priority, tie):
+                del self._priorities[key]
+                return item
+        raise IndexError('pop from an empty frontier')
+
+
+class Result(NamedTuple):
+    state: BitState  # None if the problem is not solvable
+    expanded: int
+
+
+def search(problem: BitProblem, start: BitState, priority: Callable[[BitState], float], lifo: bool = False) -> Result:
+    '''
+    Best first search from start with the given priority (a constant one with lifo=True is a depth first search).
+    The sets are added in increasing order of index, so every subset is generated once, and the subsets already
+    expanded are kept in a closed set (as bitmasks of the taken sets).
+    '''
+    frontier = Frontier(lifo)
+    frontier.push((start, -1), priority(start), start.taken)
+    closed = set()
+
+    expanded = 0
+    while frontier:
+        state, last = frontier.pop()
+        if problem.goal_check(state):
+            return Result(state, expanded)
+        closed.add(state.taken)
+        expanded += 1
+        for action in problem.not_taken(state):
+            if action < last:
+                continue
+            new_state = problem.take(state, action)
+            if new_state.taken not in closed:
+                frontier.push((new_state, action), priority(new_state), new_state.taken)
+    return Result(None, expanded)
+
+
+def dfs(problem: BitProblem, start: BitState = None) -> Result:
+    '''Depth first: the first cover found, not necessarily the smallest.'''
+    return search(problem, problem.state() if start is None else start, lambda state: 0, lifo=True)
+
+
+def greedy(problem: BitProblem, start: BitState = None) -> Result:
+    '''Best first on h2 only.'''
+    return search(problem, problem.state() if start is None else start, problem.h2)
+
+
+def astar(problem: BitProblem, start: BitState = None) -> Result:
+    '''A* with f = g + h2 (h2 is admissible, so the cover has the minimum number of sets that contain start).'''
+    return search(problem, problem.state() if start is None else start, lambda state: problem.g(state) + problem.h2(state))
+
+
+def ida_star(problem: BitProblem, start: BitState = None, h: Callable[[BitState], int] = None, cache_size: int = 0) -> Result:
+    '''
+    Iterative deepening A* on f = g + h (h2 by default): depth first searches bounded by f, each one with the bound
+    raised to the lowest f that went over the previous one. Only the current path is kept (O(depth) memory instead
+    of the whole frontier), at the cost of expanding the top of the tree again at every iteration.
+    With cache_size > 0, the lowest f beyond the bound in the subtree of the cache_size most recent states (a lower
+    bound of any cover in it) is kept, so the next iterations skip the subtrees that can't reach the bound either
+    and don't compute h again for them. The sets are added in increasing order of index as in search.
+    '''
+    start = problem.state() if start is None else start
+    h = problem.h2 if h is None else h
+    cache = OrderedDict()  # taken -> lower bound of f in the subtree
+    expanded = 0
+
+    def bounded(state: BitState, last: int, bound: float) -> tuple:
+        # (goal state or None, lowest f over the bound in the subtree)
+        nonlocal expanded
+        if state.taken in cache:
+            cache.move_to_end(state.taken)
+            f = cache[state.taken]
+        else:
+            f = problem.g(state) + h(state)
+        if f > bound:
+            return None, f
+        if problem.goal_check(state):
+            return state, f
+        expanded += 1
+        lowest = math.inf
+        for action in problem.not_taken(state):
+            if action < last:
+                continue
+            found, child_f = bounded(problem.take(state, action), action, bound)
+            if found is not None:
+                return found, child_f
+            lowest = min(lowest, child_f)
+        if cache_size:
+            cache[state.taken] = max(f, lowest)
+            cache.move_to_end(state.taken)
+            if len(cache) > cache_size:
+                cache.popitem(last=False)
+        return None, lowest
+
+    bound = problem.g(start) + h(start)
+    while bound < math.inf:
+        found, bound = bounded(start, -1, bound)
+        if found is not None:
+            return Result(found, expanded)
+    return Result(None, expanded)